@@ -1,11 +1,20 @@
 import streamlit as st
 import yfinance as yf
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
 import requests
 from datetime import datetime, timedelta
 import re
 from urllib.parse import quote
 import warnings
 import time
+import sys
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
 # 页面配置
@@ -20,12 +29,17 @@ st.markdown("**只使用验证有效的新闻源 - 高稳定性 - 高质量新
 st.markdown("---")
 
 # 初始化 session state
-if 'news_data' not in st.session_state:
-    st.session_state.news_data = None
+# 会话只保存新闻ID和显示选项，新闻内容存放在跨会话共享的存储中
+if 'news_ids' not in st.session_state:
+    st.session_state.news_ids = None
+if 'news_views' not in st.session_state:
+    st.session_state.news_views = {}
+if 'translated' not in st.session_state:
+    st.session_state.translated = False
 if 'source_stats' not in st.session_state:
     st.session_state.source_stats = {}
-if 'translated_news' not in st.session_state:
-    st.session_state.translated_news = None
+if 'news_meta' not in st.session_state:
+    st.session_state.news_meta = None
 
 # ==================== 完整翻译系统 ====================
 def complete_translate(text: str) -> str:
@@ -37,8 +51,95 @@ def complete_translate(text: str) -> str:
     if any('\u4e00' <= char <= '\u9fff' for char in text):
         return text
     
+    chunks = split_sentences(text)
+    if len(chunks) <= 1:
+        return translate_chunk(chunks[0] if chunks else text)
+    
+    # 长文本按句子并发翻译（逐句缓存），耗时取决于最慢的一句
+    translated_chunks = list(_get_translation_pool().map(translate_chunk, chunks))
+    return join_translated_chunks(translated_chunks)
+
+TRANSLATION_CHUNK_SIZE = 500  # 单次API请求的最大字符数
+TRANSLATION_CACHE_SIZE = 5000  # 最多缓存的句子数量
+
+# 句号后不断句的常见缩写
+SENTENCE_ABBREVIATIONS = {
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'gen', 'gov', 'sen', 'rep',
+    'inc', 'corp', 'co', 'ltd', 'llc', 'plc', 'bros', 'dept', 'vs', 'etc', 'approx', 'est',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+}
+
+@st.cache_resource
+def _get_translation_cache():
+    """跨会话共享的翻译缓存（LRU）"""
+    return {'entries': OrderedDict(), 'lock': threading.Lock()}
+
+@st.cache_resource
+def _get_translation_pool():
+    """翻译线程池"""
+    return ThreadPoolExecutor(max_workers=8)
+
+def split_sentences(text: str, max_len: int = TRANSLATION_CHUNK_SIZE) -> list:
+    """按句子边界切分文本 - 跳过缩写和单个大写字母，过长的句子在单词边界继续切分"""
+    sentences, start = [], 0
+    for match in re.finditer(r'[.!?]+["\')\]]*\s+', text):
+        if text[match.start()] == '.':
+            word = re.search(r'[\w.]*$', text[start:match.start()]).group(0)
+            if word.lower() in SENTENCE_ABBREVIATIONS or re.fullmatch(r'(?:[A-Za-z]\.)*[A-Za-z]', word):
+                continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+    
+    pieces = []
+    for sentence in sentences:
+        while len(sentence) > max_len:
+            cut = sentence.rfind(' ', 0, max_len)
+            if cut <= 0:
+                cut = max_len
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+def join_translated_chunks(chunks: list) -> str:
+    """按原顺序拼接翻译结果"""
+    result = ''
+    for chunk in chunks:
+        if result and result[-1].isascii() and chunk[:1].isascii():
+            result += ' '
+        result += chunk
+    return result
+
+def get_cached_translation(text: str) -> str:
+    """查询翻译缓存，未命中时返回None"""
+    cache = _get_translation_cache()
+    with cache['lock']:
+        if text in cache['entries']:
+            cache['entries'].move_to_end(text)
+            return cache['entries'][text]
+    return None
+
+def cached_api_translation(text: str) -> str:
+    """带缓存的API翻译 - 只缓存成功结果"""
+    translated = get_cached_translation(text)
+    if translated:
+        return translated
+    
+    translated = try_api_translation(text)
+    if translated and translated != text:
+        cache = _get_translation_cache()
+        with cache['lock']:
+            cache['entries'][text] = translated
+            while len(cache['entries']) > TRANSLATION_CACHE_SIZE:
+                cache['entries'].popitem(last=False)
+    return translated
+
+def translate_chunk(text: str) -> str:
+    """翻译单个文本块"""
     # 先尝试云端API翻译
-    api_result = try_api_translation(text)
+    api_result = cached_api_translation(text)
     if api_result and api_result != text:
         return api_result
     
@@ -51,7 +152,7 @@ def try_api_translation(text: str) -> str:
         # MyMemory API
         url = "https://api.mymemory.translated.net/get"
         params = {
-            'q': text[:500],  # 限制长度
+            'q': text[:TRANSLATION_CHUNK_SIZE],  # 限制长度
             'langpair': 'en|zh-CN'
         }
         
@@ -73,7 +174,7 @@ def try_api_translation(text: str) -> str:
             'sl': 'en',
             'tl': 'zh-cn',
             'dt': 't',
-            'q': text[:500]
+            'q': text[:TRANSLATION_CHUNK_SIZE]
         }
         
         response = requests.get(url, params=params, timeout=8)
@@ -197,87 +298,149 @@ def word_by_word_translate(text: str) -> str:
     return result.strip()
 
 # ==================== 新闻获取函数（保持原有逻辑）====================
-def get_yfinance_news(ticker, debug=False):
-    """获取yfinance新闻"""
+def parse_tickers(ticker):
+    """解析股票代码输入，支持逗号或空格分隔的多个代码"""
+    if not ticker:
+        return []
+    return list(dict.fromkeys(t for t in re.split(r'[,\s]+', ticker.upper()) if t))
+
+def match_tickers(title, tickers):
+    """返回标题中作为完整单词出现的股票代码（区分大小写）"""
+    return [t for t in tickers if re.search(rf'\b{re.escape(t)}\b', title)]
+
+# yfinance 新闻字段，按优先级排列（新版数据在 content 下）
+YF_ID_FIELDS = ['content.id', 'id', 'uuid']
+YF_TITLE_FIELDS = ['content.title', 'title', 'content.headline', 'headline', 'content.shortName', 'shortName']
+YF_SUMMARY_FIELDS = ['content.summary', 'summary', 'content.description', 'description', 'content.snippet', 'snippet']
+YF_URL_FIELDS = [
+    'content.clickThroughUrl.url', 'content.clickThroughUrl', 'clickThroughUrl.url', 'clickThroughUrl',
+    'content.link', 'link', 'content.url', 'url',
+    'content.canonicalUrl.url', 'content.canonicalUrl', 'canonicalUrl.url', 'canonicalUrl'
+]
+YF_TIME_FIELDS = [
+    'content.providerPublishTime', 'providerPublishTime',
+    'content.pubDate', 'pubDate', 'content.publishedAt', 'publishedAt'
+]
+
+def _fetch_ticker_news(ticker):
+    """获取单个股票的原始新闻"""
+    return yf.Ticker(ticker).news or []
+
+def _coalesce_text(frame, fields, min_len=0):
+    """按字段优先级取第一个有效文本"""
+    result = pd.Series(pd.NA, index=frame.index, dtype='string')
+    for field in fields:
+        if field not in frame:
+            continue
+        values = frame[field].astype('string').str.strip()
+        result = result.fillna(values.where(values.str.len() > min_len))
+    return result
+
+def _coalesce_time(frame, fields):
+    """按字段优先级解析发布时间，统一为本地时间"""
+    local_tz = datetime.now().astimezone().tzinfo
+    result = pd.Series(pd.NaT, index=frame.index, dtype='datetime64[ns, UTC]')
+    for field in fields:
+        if field not in frame:
+            continue
+        values = frame[field]
+        numeric = pd.to_numeric(values, errors='coerce')
+        parsed = pd.to_datetime(numeric, unit='s', utc=True, errors='coerce')
+        text = values.where(numeric.isna() & values.notna()).astype('string')
+        parsed = parsed.fillna(pd.to_datetime(text, utc=True, errors='coerce', format='ISO8601'))
+        result = result.fillna(parsed)
+    return result.dt.tz_convert(local_tz).dt.tz_localize(None)
+
+def normalize_yfinance_news(raw_by_ticker):
+    """把多个股票的原始新闻规范化为按文章ID去重的DataFrame"""
+    rows, row_tickers, positions = [], [], []
+    for ticker, raw_news in raw_by_ticker.items():
+        for i, article in enumerate(raw_news):
+            if isinstance(article, dict):
+                rows.append(article)
+                row_tickers.append(ticker)
+                positions.append(i)
+    
+    columns = ['title', 'summary', 'url', 'source', 'published', 'published_estimated', 'method', 'tickers']
+    if not rows:
+        return pd.DataFrame(columns=columns).rename_axis('id')
+    
+    raw = pd.json_normalize(rows)
+    frame = pd.DataFrame({
+        'ticker': row_tickers,
+        'title': _coalesce_text(raw, YF_TITLE_FIELDS, min_len=10),
+        'summary': _coalesce_text(raw, YF_SUMMARY_FIELDS, min_len=10).fillna('来自Yahoo Finance的财经新闻'),
+        'url': _coalesce_text(raw, YF_URL_FIELDS, min_len=10).fillna(''),
+        'published': _coalesce_time(raw, YF_TIME_FIELDS),
+    })
+    
+    # 缺少发布时间的新闻按原始顺序依次往前推1小时
+    fallback = pd.Timestamp(datetime.now()) - pd.to_timedelta(pd.Series(positions) + 1, unit='h')
+    frame['published_estimated'] = frame['published'].isna()
+    frame['published'] = frame['published'].fillna(fallback)
+    
+    # 文章ID缺失时退回到链接或标题
+    frame['id'] = _coalesce_text(raw, YF_ID_FIELDS).fillna(frame['url'].replace('', pd.NA)).fillna(frame['title'])
+    frame = frame[frame['title'].notna()]
+    
+    news = frame.groupby('id', sort=False).agg(
+        title=('title', 'first'),
+        summary=('summary', 'first'),
+        url=('url', 'first'),
+        published=('published', 'first'),
+        published_estimated=('published_estimated', 'first'),
+        tickers=('ticker', lambda s: list(dict.fromkeys(s))),
+    )
+    news['source'] = 'Yahoo Finance'
+    news['method'] = 'yfinance'
+    return news[columns]
+
+def get_yfinance_news_bulk(tickers, debug=False, raise_errors=False):
+    """并发获取多个股票的yfinance新闻，返回按文章ID索引的DataFrame"""
+    raw_by_ticker, errors = {}, {}
+    if tickers:
+        with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as pool:
+            futures = {ticker: pool.submit(_fetch_ticker_news, ticker) for ticker in tickers}
+            for ticker, future in futures.items():
+                try:
+                    raw_by_ticker[ticker] = future.result()
+                except Exception as e:
+                    errors[ticker] = str(e)
+    
+    if debug:
+        for ticker, error in errors.items():
+            st.sidebar.error(f"❌ yfinance获取{ticker}失败: {error}")
+    
+    if raise_errors and errors and not raw_by_ticker:
+        raise RuntimeError('; '.join(f"{ticker}: {error}" for ticker, error in errors.items()))
+    
+    return normalize_yfinance_news(raw_by_ticker)
+
+def news_frame_to_records(news_frame):
+    """DataFrame转换为新闻字典列表"""
+    records = news_frame.reset_index().to_dict('records')
+    for record in records:
+        record['title'] = str(record['title'])
+        record['summary'] = str(record['summary'])
+        record['url'] = str(record['url'])
+        record['published'] = record['published'].to_pydatetime()
+        record['published_estimated'] = bool(record['published_estimated'])
+    return records
+
+def get_yfinance_news(ticker, debug=False, raise_errors=False):
+    """获取yfinance新闻（支持多个股票代码）"""
+    tickers = parse_tickers(ticker) if isinstance(ticker, str) else list(ticker)
     try:
         if debug:
-            st.sidebar.write(f"🔍 正在获取 yfinance {ticker} 新闻...")
+            st.sidebar.write(f"🔍 正在获取 yfinance {', '.join(tickers)} 新闻...")
         
-        stock = yf.Ticker(ticker)
-        raw_news = stock.news
+        processed_news = news_frame_to_records(get_yfinance_news_bulk(tickers, debug, raise_errors))
         
-        if not raw_news:
+        if not processed_news:
             if debug:
                 st.sidebar.warning("⚠️ yfinance: 无新闻数据")
             return []
         
-        processed_news = []
-        for i, article in enumerate(raw_news):
-            try:
-                if not isinstance(article, dict):
-                    continue
-                
-                content_data = article.get('content', article)
-                
-                title = ''
-                for title_field in ['title', 'headline', 'shortName']:
-                    t = content_data.get(title_field, '') or article.get(title_field, '')
-                    if t and len(str(t).strip()) > 10:
-                        title = str(t).strip()
-                        break
-                
-                if not title:
-                    continue
-                
-                summary = ''
-                for summary_field in ['summary', 'description', 'snippet']:
-                    s = content_data.get(summary_field, '') or article.get(summary_field, '')
-                    if s and len(str(s).strip()) > 10:
-                        summary = str(s).strip()
-                        break
-                
-                url = ''
-                click_url = content_data.get('clickThroughUrl', {})
-                if isinstance(click_url, dict):
-                    url = click_url.get('url', '')
-                elif isinstance(click_url, str):
-                    url = click_url
-                
-                if not url:
-                    for url_field in ['link', 'url', 'canonicalUrl']:
-                        u = content_data.get(url_field, '') or article.get(url_field, '')
-                        if u and isinstance(u, str) and len(u) > 10:
-                            url = u
-                            break
-                
-                published_time = datetime.now() - timedelta(hours=i+1)
-                for time_field in ['providerPublishTime', 'publishedAt']:
-                    time_val = content_data.get(time_field) or article.get(time_field)
-                    if time_val:
-                        try:
-                            if isinstance(time_val, (int, float)):
-                                published_time = datetime.fromtimestamp(time_val)
-                                break
-                            elif isinstance(time_val, str):
-                                published_time = datetime.fromisoformat(time_val.replace('Z', '+00:00')).replace(tzinfo=None)
-                                break
-                        except:
-                            continue
-                
-                processed_news.append({
-                    'title': title,
-                    'summary': summary or '来自Yahoo Finance的财经新闻',
-                    'url': url,
-                    'source': 'Yahoo Finance',
-                    'published': published_time,
-                    'method': 'yfinance'
-                })
-                
-            except Exception as e:
-                if debug:
-                    st.sidebar.error(f"yfinance处理第{i+1}条新闻失败: {str(e)}")
-                continue
-        
         if debug:
             st.sidebar.success(f"✅ yfinance: 成功获取 {len(processed_news)} 条新闻")
         
@@ -286,9 +449,11 @@ def get_yfinance_news(ticker, debug=False):
     except Exception as e:
         if debug:
             st.sidebar.error(f"❌ yfinance获取失败: {str(e)}")
+        if raise_errors:
+            raise
         return []
 
-def get_google_news(query, debug=False):
+def get_google_news(query, debug=False, raise_errors=False):
     """获取Google News"""
     try:
         if debug:
@@ -306,6 +471,8 @@ def get_google_news(query, debug=False):
         if response.status_code != 200:
             if debug:
                 st.sidebar.warning(f"⚠️ Google News: HTTP {response.status_code}")
+            if raise_errors:
+                raise RuntimeError(f"HTTP {response.status_code}")
             return []
         
         content = response.text
@@ -337,6 +504,7 @@ def get_google_news(query, debug=False):
                     'url': link,
                     'source': 'Google News',
                     'published': datetime.now() - timedelta(hours=i/2),
+                    'published_estimated': True,  # RSS未解析发布时间，按顺序估算
                     'method': 'Google News RSS'
                 })
                 
@@ -351,9 +519,11 @@ def get_google_news(query, debug=False):
     except Exception as e:
         if debug:
             st.sidebar.error(f"❌ Google News获取失败: {str(e)}")
+        if raise_errors:
+            raise
         return []
 
-def get_yahoo_rss_news(ticker=None, debug=False):
+def get_yahoo_rss_news(ticker=None, debug=False, raise_errors=False):
     """获取Yahoo RSS新闻"""
     try:
         if debug:
@@ -365,6 +535,8 @@ def get_yahoo_rss_news(ticker=None, debug=False):
         response = requests.get(url, timeout=15, headers=headers)
         
         if response.status_code != 200:
+            if raise_errors:
+                raise RuntimeError(f"HTTP {response.status_code}")
             return []
         
         content = response.text
@@ -386,7 +558,7 @@ def get_yahoo_rss_news(ticker=None, debug=False):
                 if not title or len(title) < 10:
                     continue
                 
-                if ticker and ticker.lower() not in title.lower():
+                if ticker and not match_tickers(title, parse_tickers(ticker)):
                     continue
                 
                 link_match = re.search(r'<link[^>]*>(.*?)</link>', item, re.DOTALL | re.IGNORECASE)
@@ -398,6 +570,7 @@ def get_yahoo_rss_news(ticker=None, debug=False):
                     'url': link,
                     'source': 'Yahoo Finance RSS',
                     'published': datetime.now() - timedelta(hours=i/2),
+                    'published_estimated': True,  # RSS未解析发布时间，按顺序估算
                     'method': 'RSS'
                 })
                 
@@ -412,6 +585,8 @@ def get_yahoo_rss_news(ticker=None, debug=False):
     except Exception as e:
         if debug:
             st.sidebar.error(f"❌ Yahoo RSS获取失败: {str(e)}")
+        if raise_errors:
+            raise
         return []
 
 def smart_remove_duplicates(news_list):
@@ -429,43 +604,395 @@ def smart_remove_duplicates(news_list):
     
     return unique_news
 
-@st.cache_data(ttl=900)
-def get_all_reliable_news(ticker=None, debug=False):
-    """获取所有可靠新闻源的新闻"""
-    all_news = []
-    source_stats = {}
-    
-    if ticker:
-        yf_news = get_yfinance_news(ticker, debug)
-        all_news.extend(yf_news)
-        source_stats['yfinance'] = len(yf_news)
-    else:
-        source_stats['yfinance'] = 0
+# ==================== 新闻缓存（stale-while-revalidate）====================
+NEWS_CACHE_TTL = 900  # 15分钟内视为新鲜数据
+NEWS_MAX_STALENESS = 3600  # 超过1小时的旧数据不再直接返回，需同步等待刷新
+
+@st.cache_resource
+def _get_news_cache():
+    """跨会话共享的新闻缓存"""
+    # generation 在清除缓存时递增，旧的后台刷新结果不会再写回
+    return {'entries': {}, 'refreshing': {}, 'generation': 0, 'lock': threading.Lock()}
+
+def _fetch_news_by_source(ticker=None, debug=False):
+    """分别获取各新闻源的新闻，返回 (各源新闻, 各源错误)"""
+    tickers = parse_tickers(ticker)
     
-    if ticker:
-        google_query = f"{ticker} stock financial earnings revenue"
+    if tickers:
+        google_query = f"{' OR '.join(tickers)} stock financial earnings revenue"
     else:
         google_query = "stock market financial news earnings revenue"
     
-    google_news = get_google_news(google_query, debug)
-    all_news.extend(google_news)
-    source_stats['Google News'] = len(google_news)
+    fetchers = {
+        'yfinance': lambda: get_yfinance_news(tickers, debug, raise_errors=True) if tickers else [],
+        'Google News': lambda: get_google_news(google_query, debug, raise_errors=True),
+        'Yahoo RSS': lambda: get_yahoo_rss_news(ticker, debug, raise_errors=True),
+    }
+    
+    by_source, errors = {}, {}
+    for name, fetch in fetchers.items():
+        try:
+            by_source[name] = fetch()
+        except Exception as e:
+            by_source[name] = []
+            errors[name] = str(e)
     
-    yahoo_rss_news = get_yahoo_rss_news(ticker, debug)
-    all_news.extend(yahoo_rss_news)
-    source_stats['Yahoo RSS'] = len(yahoo_rss_news)
+    # 单个股票的Google News结果都属于该股票（标题多用公司名而非代码）；
+    # 其余新闻按标题匹配所属股票，未匹配的归入市场整体
+    for name, items in by_source.items():
+        for news in items:
+            if 'tickers' in news:
+                continue
+            if name == 'Google News' and len(tickers) == 1:
+                news['tickers'] = list(tickers)
+            else:
+                news['tickers'] = match_tickers(news['title'], tickers)
     
+    return by_source, errors
+
+def _merge_news_sources(by_source):
+    """合并各新闻源的结果，返回去重后的新闻"""
+    all_news = [news for items in by_source.values() for news in items]
     unique_news = smart_remove_duplicates(all_news)
     unique_news.sort(key=lambda x: x['published'], reverse=True)
+    return unique_news
+
+def _store_news_result(key, by_source, errors, generation, max_staleness=NEWS_MAX_STALENESS):
+    """写入缓存 - 获取失败的新闻源在max_staleness内沿用上次的结果
+
+    来源统计只反映本次获取的结果，沿用的旧数据不计入。
+
+    新闻内容写入共享新闻存储，缓存条目只保存新闻ID，
+    存储按内存预算淘汰条目时内存能真正释放。
+    """
+    cache = _get_news_cache()
+    with cache['lock']:
+        previous = cache['entries'].get(key)
+        previous_sources = previous['by_source'] if previous else {}
+        previous_times = previous['source_fetched_at'] if previous else {}
+        
+        now = time.time()
+        merged, source_times, errors = {}, {}, dict(errors)
+        for name, items in by_source.items():
+            previous_at = previous_times.get(name, 0)
+            if name in errors and now - previous_at < max_staleness:
+                previous_items = get_news_items(previous_sources.get(name, []), previous['views'])
+                if previous_items:
+                    merged[name] = previous_items
+                    source_times[name] = previous_at
+                    errors[name] = f"{errors[name]}，沿用 {(now - previous_at) / 60:.0f} 分钟前的结果"
+                    continue
+            merged[name] = items
+            source_times[name] = now
+        
+        # 所有新闻源都获取失败时保留原来的获取时间，下次请求继续尝试刷新
+        refreshed = len(errors) < len(by_source) or not previous
+        news = _merge_news_sources(merged)
+        stored_sources, views = {}, {}
+        for name, items in merged.items():
+            stored_sources[name], source_views = put_news_items(items)
+            views.update(source_views)
+        entry = {
+            'by_source': stored_sources,
+            'views': views,
+            'source_fetched_at': source_times,
+            'news': [news_item_id(item) for item in news],
+            'stats': {name: len(items) for name, items in by_source.items()},
+            'errors': errors,
+            'fetched_at': now if refreshed else previous['fetched_at'],
+        }
+        if cache['generation'] == generation:
+            cache['entries'][key] = entry
+        return entry
+
+def _refresh_news_in_background(key, ticker, generation, max_staleness):
+    """后台刷新新闻"""
+    cache = _get_news_cache()
+    try:
+        by_source, errors = _fetch_news_by_source(ticker)
+        _store_news_result(key, by_source, errors, generation, max_staleness)
+    finally:
+        with cache['lock']:
+            if cache['refreshing'].get(key) == generation:
+                del cache['refreshing'][key]
+
+def _schedule_news_refresh(key, ticker, max_staleness):
+    """每个键同时只触发一次后台刷新"""
+    cache = _get_news_cache()
+    with cache['lock']:
+        if key in cache['refreshing']:
+            return
+        generation = cache['generation']
+        cache['refreshing'][key] = generation
+    threading.Thread(target=_refresh_news_in_background, args=(key, ticker, generation, max_staleness), daemon=True).start()
+
+def is_news_refreshing(key):
+    """该键是否有正在进行的后台刷新"""
+    cache = _get_news_cache()
+    with cache['lock']:
+        return key in cache['refreshing']
+
+def clear_news_cache():
+    """清除新闻缓存，正在进行的后台刷新结果将被丢弃"""
+    cache = _get_news_cache()
+    with cache['lock']:
+        cache['generation'] += 1
+        cache['entries'].clear()
+        cache['refreshing'].clear()
+
+def get_all_reliable_news(ticker=None, debug=False, max_staleness=NEWS_MAX_STALENESS):
+    """获取所有可靠新闻源的新闻
+
+    超过TTL的数据会立即返回并在后台刷新；超过max_staleness时同步获取。
+    返回 (新闻列表, 来源统计, 元信息)，元信息包含缓存键、获取时间、
+    各新闻源错误以及是否触发了后台刷新。
+    """
+    key = ','.join(parse_tickers(ticker))
+    cache = _get_news_cache()
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        generation = cache['generation']
+    
+    # 部分新闻已被共享存储淘汰的缓存条目视为失效
+    news = get_news_items(entry['news'], entry['views']) if entry else []
+    if entry and len(news) < len(entry['news']):
+        entry = None
+    
+    refreshing = False
+    if entry and time.time() - entry['fetched_at'] < max_staleness:
+        if time.time() - entry['fetched_at'] >= NEWS_CACHE_TTL:
+            _schedule_news_refresh(key, ticker, max_staleness)
+            refreshing = True
+    else:
+        by_source, errors = _fetch_news_by_source(ticker, debug)
+        entry = _store_news_result(key, by_source, errors, generation, max_staleness)
+        news = get_news_items(entry['news'], entry['views'])
     
-    return unique_news, source_stats
+    meta = {
+        'key': key,
+        'fetched_at': entry['fetched_at'],
+        'errors': entry['errors'],
+        'refreshing': refreshing,
+    }
+    return news, entry['stats'], meta
+
+# ==================== 共享新闻存储 ====================
+NEWS_STORE_BUDGET = 64 * 1024 * 1024  # 共享新闻存储的内存上限（字节）
+
+class NewsItemStore:
+    """跨会话共享的新闻条目存储 - 引用计数 + 内存预算 + LRU淘汰"""
+    
+    def __init__(self, budget=NEWS_STORE_BUDGET):
+        self.budget = budget
+        self.items = OrderedDict()  # 按最近使用排序
+        self.unreferenced = OrderedDict()  # 无人引用的条目，按最近使用排序，优先淘汰
+        self.sizes = {}
+        self.refs = {}
+        self.pending_releases = deque()  # 会话回收时待释放的引用
+        self.total_size = 0
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def estimate_size(item):
+        """估算条目占用的内存"""
+        return sys.getsizeof(item) + sum(sys.getsizeof(v) for v in item.values())
+    
+    def put(self, key, item):
+        """写入条目，替换同一键的已有条目"""
+        with self.lock:
+            self._drain_pending_releases()
+            if key in self.items:
+                self.total_size -= self.sizes[key]
+            self._insert(key, item)
+            self._evict()
+    
+    def setdefault(self, key, item):
+        """条目不存在时写入，返回存储中的条目 - 同一篇文章只保存一份"""
+        with self.lock:
+            self._drain_pending_releases()
+            if key in self.items:
+                self._touch(key)
+                return self.items[key]
+            self._insert(key, item)
+            self._evict()
+            return item
+    
+    def get(self, key):
+        """读取条目，已被淘汰时返回None"""
+        with self.lock:
+            item = self.items.get(key)
+            if item is not None:
+                self._touch(key)
+            return item
+    
+    def acquire(self, keys):
+        """增加引用计数"""
+        with self.lock:
+            self._drain_pending_releases()
+            for key in keys:
+                self.refs[key] = self.refs.get(key, 0) + 1
+                self.unreferenced.pop(key, None)
+    
+    def release(self, keys):
+        """减少引用计数"""
+        with self.lock:
+            self._drain_pending_releases()
+            self._release(keys)
+            self._evict()
+    
+    def release_later(self, keys):
+        """登记待释放的引用 - 供垃圾回收时调用，不获取锁"""
+        self.pending_releases.append(list(keys))
+    
+    def _drain_pending_releases(self):
+        while self.pending_releases:
+            self._release(self.pending_releases.popleft())
+    
+    def _release(self, keys):
+        for key in keys:
+            count = self.refs.get(key, 0) - 1
+            if count > 0:
+                self.refs[key] = count
+                continue
+            self.refs.pop(key, None)
+            if key in self.items:
+                self.unreferenced[key] = None
+    
+    def _insert(self, key, item):
+        self.items[key] = item
+        self.sizes[key] = self.estimate_size(item)
+        self.total_size += self.sizes[key]
+        if not self.refs.get(key):
+            self.unreferenced[key] = None
+        self._touch(key)
+    
+    def _touch(self, key):
+        self.items.move_to_end(key)
+        if key in self.unreferenced:
+            self.unreferenced.move_to_end(key)
+    
+    def _remove(self, key):
+        # 引用计数保持不变，由持有引用的会话释放
+        self.total_size -= self.sizes.pop(key)
+        del self.items[key]
+        self.unreferenced.pop(key, None)
+    
+    def _evict(self):
+        """超出预算时先淘汰无人引用的条目，仍超出时再按LRU淘汰被引用的条目 - 均摊O(1)"""
+        while self.total_size > self.budget and self.unreferenced:
+            self._remove(next(iter(self.unreferenced)))
+        # 被引用的条目占满预算时仍需兜底
+        while self.total_size > self.budget and self.items:
+            self._remove(next(iter(self.items)))
+
+@st.cache_resource
+def _get_news_store():
+    """跨会话共享的新闻存储"""
+    return NewsItemStore()
+
+# 取决于查询条件的字段：所属股票，以及Google News按查询生成的摘要
+QUERY_FIELDS = ('tickers', 'summary')
+
+def news_item_id(news):
+    """新闻条目的稳定ID - 优先使用来源提供的文章ID"""
+    if news.get('id'):
+        return str(news['id'])
+    fingerprint = f"{news.get('url', '')}|{news['title']}"
+    return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:16]
+
+def put_news_items(news_list):
+    """把新闻写入共享存储，返回 (新闻ID列表, 各条新闻的查询相关字段)
+
+    存储中已有同一篇文章时沿用已有内容，本次查询的所属股票以及与已有内容
+    不同的查询相关字段由调用方（缓存条目或会话）保存，不会覆盖其他查询的结果。
+    """
+    store = _get_news_store()
+    ids, views = [], {}
+    for news in news_list:
+        item_id = news_item_id(news)
+        stored = store.setdefault(item_id, {k: v for k, v in news.items() if k != 'tickers'})
+        view = {field: news[field] for field in QUERY_FIELDS
+                if field in news and stored.get(field) != news[field]}
+        if view:
+            views[item_id] = view
+        ids.append(item_id)
+    return ids, views
+
+def get_news_items(ids, views=None):
+    """按ID从共享存储取回新闻并合并查询相关字段，跳过已被淘汰的条目"""
+    store = _get_news_store()
+    views = views or {}
+    news_list = []
+    for item_id in ids:
+        news = store.get(item_id)
+        if news is not None:
+            news_list.append({**news, **views.get(item_id, {})})
+    return news_list
+
+class SessionNewsRefs:
+    """会话持有的共享存储引用 - 会话结束被回收时自动释放"""
+    
+    def __init__(self, store):
+        self.store = store
+        self.keys = []
+        # 回调只持有存储和键列表，不持有本对象；可能在任意线程的垃圾回收中执行，不能加锁
+        self._finalizer = weakref.finalize(self, store.release_later, self.keys)
+    
+    def replace(self, keys):
+        """改为持有新的一组引用"""
+        self.store.acquire(keys)
+        self.store.release(list(self.keys))
+        self.keys[:] = keys
+
+def _get_session_refs():
+    """当前会话的引用集合"""
+    if 'news_refs' not in st.session_state:
+        st.session_state.news_refs = SessionNewsRefs(_get_news_store())
+    return st.session_state.news_refs
+
+def translation_key(news):
+    """翻译结果在共享存储中的键 - 摘要随查询变化时分别保存"""
+    digest = hashlib.sha1(news.get('summary', '').encode('utf-8')).hexdigest()[:8]
+    return f"zh:{news_item_id(news)}:{digest}"
+
+def set_session_news(news_list, translated):
+    """把新闻写入共享存储，会话只保留引用和查询相关字段
+
+    需要翻译时先持有翻译结果的引用，再写入翻译，避免刚写入的翻译被优先淘汰。
+    """
+    ids, views = put_news_items(news_list)
+    refs = ids + ([translation_key(news) for news in news_list] if translated else [])
+    _get_session_refs().replace(refs)
+    st.session_state.news_ids = ids
+    st.session_state.news_views = views
+    st.session_state.translated = translated
+
+def clear_session_news():
+    """释放会话持有的新闻引用"""
+    _get_session_refs().replace([])
+    st.session_state.news_ids = None
+    st.session_state.news_views = {}
+    st.session_state.translated = False
+
+def load_session_news():
+    """从共享存储取回会话的新闻，返回 (原文列表, 翻译列表或None)"""
+    store = _get_news_store()
+    news_data = get_news_items(st.session_state.news_ids or [], st.session_state.news_views)
+    if not st.session_state.translated:
+        return news_data, None
+    
+    translated_news = []
+    for news in news_data:
+        translation = store.get(translation_key(news))
+        translated_news.append({**news, **translation} if translation else news)
+    return news_data, translated_news
 
 def translate_news_batch(news_list):
-    """批量翻译新闻"""
+    """批量翻译新闻 - 结果写入共享存储，其他会话已翻译的条目直接复用"""
     if not news_list:
-        return []
+        return
     
-    translated_news = []
+    store = _get_news_store()
     total_count = len(news_list)
     
     progress_bar = st.progress(0)
@@ -476,25 +1003,25 @@ def translate_news_batch(news_list):
         progress_bar.progress(progress)
         status_text.text(f"🌐 正在翻译第 {i+1}/{total_count} 条新闻...")
         
-        translated_item = news.copy()
+        key = translation_key(news)
+        if store.get(key) is not None:
+            continue
+        
+        translation = {}
         
         # 翻译标题
         if news.get('title'):
-            translated_title = complete_translate(news['title'])
-            translated_item['title_zh'] = translated_title
+            translation['title_zh'] = complete_translate(news['title'])
         
         # 翻译摘要
         if news.get('summary'):
-            translated_summary = complete_translate(news['summary'])
-            translated_item['summary_zh'] = translated_summary
+            translation['summary_zh'] = complete_translate(news['summary'])
         
-        translated_news.append(translated_item)
+        store.put(key, translation)
         time.sleep(0.2)
     
     progress_bar.empty()
     status_text.empty()
-    
-    return translated_news
 
 def analyze_news_sentiment(title, summary):
     """新闻情绪分析"""
@@ -513,6 +1040,210 @@ def analyze_news_sentiment(title, summary):
     else:
         return '中性', 'gray'
 
+# ==================== 情绪时间序列 ====================
+SENTIMENT_SCORES = {'利好': 1, '利空': -1, '中性': 0}
+SENTIMENT_WINDOWS = {'1小时': 3600, '1天': 86400, '7天': 7 * 86400}
+SENTIMENT_CAPACITY = 2048  # 每个股票保留的最大数据点数
+SENTIMENT_MAX_REWIND = 64  # 迟到数据最多插入到最近多少个数据点之前
+
+class SentimentSeries:
+    """单个股票的滚动情绪时间序列 - 环形缓冲区 + 增量窗口求和"""
+    
+    def __init__(self, capacity=SENTIMENT_CAPACITY, windows=SENTIMENT_WINDOWS):
+        self.capacity = capacity
+        self.labels = list(windows.keys())
+        self.windows = list(windows.values())
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.scores = np.zeros(capacity, dtype=np.int8)
+        self.rolling = np.zeros((len(self.windows), capacity), dtype=np.float32)
+        self.count = 0  # 累计写入的数据点数量
+        self.tails = [0] * len(self.windows)  # 各窗口内最早数据点的累计位置
+        self.sums = [0] * len(self.windows)
+        self.seen = OrderedDict()
+    
+    def _append(self, timestamp, score):
+        """在末尾追加一个不早于现有数据的点 - 均摊O(1)"""
+        cap = self.capacity
+        
+        # 缓冲区已满时，先把即将被覆盖的数据点移出窗口
+        oldest = self.count - cap
+        for w in range(len(self.windows)):
+            if self.tails[w] <= oldest:
+                self.sums[w] -= int(self.scores[self.tails[w] % cap])
+                self.tails[w] += 1
+        
+        pos = self.count % cap
+        self.timestamps[pos] = timestamp
+        self.scores[pos] = score
+        self.count += 1
+        
+        for w, window in enumerate(self.windows):
+            self.sums[w] += score
+            while self.timestamps[self.tails[w] % cap] <= timestamp - window:
+                self.sums[w] -= int(self.scores[self.tails[w] % cap])
+                self.tails[w] += 1
+            self.rolling[w, pos] = self.sums[w] / (self.count - self.tails[w])
+    
+    def _rewind(self, position):
+        """回退到指定的累计位置，返回被移出的 (时间, 得分)"""
+        cap = self.capacity
+        lo = max(0, self.count - cap)
+        removed = np.arange(position, self.count) % cap
+        removed_timestamps = self.timestamps[removed].copy()
+        removed_scores = self.scores[removed].copy()
+        
+        # 按回退后的最后一个数据点重建各窗口的起点和累计得分
+        kept = np.arange(lo, position) % cap
+        for w, window in enumerate(self.windows):
+            if len(kept):
+                start = int(np.searchsorted(self.timestamps[kept], self.timestamps[kept[-1]] - window, side='right'))
+                self.tails[w] = lo + start
+                self.sums[w] = int(self.scores[kept[start:]].sum())
+            else:
+                self.tails[w] = position
+                self.sums[w] = 0
+        self.count = position
+        return removed_timestamps, removed_scores
+    
+    def add_many(self, timestamps, scores):
+        """按时间顺序写入一批数据点
+
+        全部晚于现有数据时逐个追加（均摊O(1)）。较早的数据点只在最近
+        SENTIMENT_MAX_REWIND 个数据点和最大窗口范围内插入到正确位置，
+        更早的迟到数据直接丢弃，保证单批写入的代价有上限。
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.int8)
+        if not len(timestamps):
+            return
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, scores = timestamps[order], scores[order]
+        
+        if self.count:
+            cap = self.capacity
+            start = max(0, self.count - cap, self.count - SENTIMENT_MAX_REWIND)
+            view = self.timestamps[np.arange(start, self.count) % cap]
+            keep = timestamps > view[-1] - max(self.windows)
+            if start > 0:
+                keep &= timestamps >= view[0]
+            timestamps, scores = timestamps[keep], scores[keep]
+        
+        if self.count and len(timestamps) and timestamps[0] < view[-1]:
+            position = start + int(np.searchsorted(view, timestamps[0], side='right'))
+            removed_timestamps, removed_scores = self._rewind(position)
+            timestamps = np.concatenate([removed_timestamps, timestamps])
+            scores = np.concatenate([removed_scores, scores])
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, scores = timestamps[order], scores[order]
+        
+        # 比缓冲区中保留的数据更早的点会在追加过程中被自然淘汰
+        for timestamp, score in zip(timestamps.tolist(), scores.tolist()):
+            self._append(timestamp, score)
+    
+    def add(self, timestamp, score):
+        """写入一个数据点"""
+        self.add_many([timestamp], [score])
+    
+    def ingest(self, news_list):
+        """增量写入新闻情绪 - 已记录过的新闻和发布时间为估算值的新闻会被跳过"""
+        timestamps, scores = [], []
+        for news in news_list:
+            if news.get('published_estimated'):
+                continue
+            key = news.get('url') or news['title']
+            if key in self.seen:
+                continue
+            self.seen[key] = True
+            if len(self.seen) > self.capacity * 2:
+                self.seen.popitem(last=False)
+            
+            sentiment, _ = analyze_news_sentiment(news['title'], news['summary'])
+            # 与新闻时间一致，按本地时间记录
+            timestamps.append((news['published'] - datetime(1970, 1, 1)).total_seconds())
+            scores.append(SENTIMENT_SCORES[sentiment])
+        
+        self.add_many(timestamps, scores)
+        return len(timestamps)
+    
+    def history(self):
+        """按时间顺序返回 (时间, 各窗口滚动均值)"""
+        idx = np.arange(max(0, self.count - self.capacity), self.count) % self.capacity
+        times = self.timestamps[idx].astype(np.int64).astype('datetime64[s]')
+        return times, self.rolling[:, idx]
+    
+    def latest(self):
+        """各窗口最新的滚动均值"""
+        if not self.count:
+            return None
+        return self.rolling[:, (self.count - 1) % self.capacity].copy()
+
+@st.cache_resource
+def _get_sentiment_store():
+    """跨会话共享的情绪时间序列"""
+    return {'series': {}, 'lock': threading.Lock()}
+
+def record_news_sentiment(key, news_list):
+    """把新闻情绪写入对应股票的时间序列"""
+    store = _get_sentiment_store()
+    with store['lock']:
+        series = store['series'].get(key)
+        if series is None:
+            series = store['series'][key] = SentimentSeries()
+        return series.ingest(news_list)
+
+def record_ticker_sentiment(news_list):
+    """按新闻所属股票分别写入情绪时间序列"""
+    by_ticker = {}
+    for news in news_list:
+        for key in news.get('tickers') or ['市场']:
+            by_ticker.setdefault(key, []).append(news)
+    for key, items in by_ticker.items():
+        record_news_sentiment(key, items)
+
+def get_sentiment_series(key):
+    """获取股票的情绪时间序列"""
+    store = _get_sentiment_store()
+    with store['lock']:
+        return store['series'].get(key)
+
+def build_sentiment_chart(series, title):
+    """滚动情绪走势图"""
+    times, rolling = series.history()
+    fig = go.Figure()
+    for label, values in zip(series.labels, rolling):
+        fig.add_trace(go.Scatter(x=times, y=values, mode='lines', name=f"{label}滚动"))
+    fig.update_layout(
+        title=title,
+        yaxis=dict(title='情绪得分 (利空 -1 ~ 利好 +1)', range=[-1.05, 1.05]),
+        hovermode='x unified',
+        height=360,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig
+
+def build_sentiment_overview_chart(keys):
+    """当前关注列表中各股票最新滚动情绪对比图"""
+    store = _get_sentiment_store()
+    with store['lock']:
+        latest = {key: store['series'][key].latest() for key in keys
+                  if key in store['series'] and store['series'][key].count}
+    if len(latest) < 2:
+        return None
+    
+    keys = list(latest.keys())
+    values = np.array([latest[key] for key in keys])
+    fig = go.Figure()
+    for w, label in enumerate(SENTIMENT_WINDOWS.keys()):
+        fig.add_trace(go.Bar(x=keys, y=values[:, w], name=f"{label}滚动"))
+    fig.update_layout(
+        title='关注列表情绪对比',
+        barmode='group',
+        yaxis=dict(title='情绪得分', range=[-1.05, 1.05]),
+        height=360,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig
+
 # ==================== 用户界面 ====================
 with st.sidebar:
     st.header("📰 可靠新闻源设置")
@@ -520,7 +1251,7 @@ with st.sidebar:
     ticker = st.text_input(
         "股票代码 (可选):",
         placeholder="例如: ASTS, AAPL, AMZN, TSLA",
-        help="输入代码获取相关新闻，留空获取市场综合新闻"
+        help="输入代码获取相关新闻，多个代码用逗号分隔，留空获取市场综合新闻"
     ).upper().strip()
     
     st.markdown("---")
@@ -558,23 +1289,25 @@ with st.sidebar:
     # 主要按钮
     if st.button("📰 获取最新新闻", type="primary"):
         with st.spinner("正在从可靠新闻源获取数据..."):
-            news_data, stats = get_all_reliable_news(ticker, debug_mode)
-            st.session_state.news_data = news_data
+            news_data, stats, meta = get_all_reliable_news(ticker, debug_mode)
             st.session_state.source_stats = stats
+            st.session_state.news_meta = meta
+            if news_data:
+                record_ticker_sentiment(news_data)
             
-            if translation_enabled and news_data:
+            # 先持有新闻和翻译结果的引用，再写入翻译
+            translated = bool(translation_enabled and news_data)
+            set_session_news(news_data, translated)
+            if translated:
                 with st.spinner("🌐 正在进行完整翻译..."):
-                    translated_news = translate_news_batch(news_data)
-                    st.session_state.translated_news = translated_news
+                    translate_news_batch(news_data)
                 st.success("✅ 翻译完成！")
-            else:
-                st.session_state.translated_news = None
     
     if st.button("🔄 清除缓存"):
-        get_all_reliable_news.clear()
-        st.session_state.news_data = None
+        clear_news_cache()
+        clear_session_news()
         st.session_state.source_stats = {}
-        st.session_state.translated_news = None
+        st.session_state.news_meta = None
         st.success("缓存已清除！")
 
 # ==================== 测试翻译功能 ====================
@@ -649,10 +1382,12 @@ def display_news_item(news, index, show_translation=True, show_original=False):
         st.markdown("---")
 
 # 主界面
-if st.session_state.news_data is not None:
-    news_data = st.session_state.news_data
+if st.session_state.news_ids is not None:
+    news_data, translated_news = load_session_news()
     source_stats = st.session_state.source_stats
-    translated_news = st.session_state.translated_news
+    
+    if len(news_data) < len(st.session_state.news_ids):
+        st.warning("⚠️ 部分新闻已因内存限制从缓存中移除，请重新获取最新新闻")
     
     if len(news_data) > 0:
         st.subheader("📊 数据源统计")
@@ -690,6 +1425,18 @@ if st.session_state.news_data is not None:
         else:
             st.error(f"🛡️ 系统可靠性: {reliability:.0f}% - 需要改进")
         
+        news_meta = st.session_state.news_meta
+        if news_meta:
+            for source, error in news_meta['errors'].items():
+                st.warning(f"⚠️ {source}: {error}")
+            
+            news_age = time.time() - news_meta['fetched_at']
+            if news_age >= NEWS_CACHE_TTL:
+                age_notice = f"🕒 当前显示 {news_age / 60:.0f} 分钟前的缓存新闻"
+                if news_meta['refreshing'] and is_news_refreshing(news_meta['key']):
+                    age_notice += "，后台正在刷新，稍后再次获取即可看到最新结果"
+                st.info(age_notice)
+        
         st.markdown("---")
         
         display_news = translated_news if translated_news else news_data
@@ -722,6 +1469,19 @@ if st.session_state.news_data is not None:
                     st.error(f"📉 **{sentiment}**: {count} 条 ({pct:.0f}%)")
                 else:
                     st.info(f"📊 **{sentiment}**: {count} 条 ({pct:.0f}%)")
+        
+        # 滚动情绪时间序列
+        tracked = [(key, get_sentiment_series(key)) for key in (parse_tickers(ticker) or ['市场'])]
+        tracked = [(key, series) for key, series in tracked if series is not None and series.count]
+        if tracked:
+            st.markdown("### 📉 滚动情绪走势")
+            for key, series in tracked:
+                st.plotly_chart(build_sentiment_chart(series, f"{key} 滚动情绪 (1小时 / 1天 / 7天)"),
+                                use_container_width=True)
+            
+            overview_chart = build_sentiment_overview_chart([key for key, _ in tracked])
+            if overview_chart is not None:
+                st.plotly_chart(overview_chart, use_container_width=True)
     
     else:
         st.warning("📭 未获取到新闻数据")